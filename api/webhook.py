@@ -3,6 +3,11 @@
 Uses lazy initialization so health checks can succeed even when the bot token
 is missing, and so cold starts fail with a clear error body instead of an
 opaque FUNCTION_INVOCATION_FAILED crash during import.
+
+Vercel's Python runtime expects a ``BaseHTTPRequestHandler`` named ``handler``,
+so updates hop from the request thread onto a dedicated event-loop thread.
+Self-hosted deployments should run ``bot.py`` with ``USE_WEBHOOK=true`` instead:
+PTB's built-in webhook server listens on the same loop as the application.
 """
 
 from __future__ import annotations
@@ -11,11 +16,17 @@ import asyncio
 import json
 import logging
 import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler
 from typing import Any, Optional
 
 from telegram import Update
 
+from store import dumps, loads
+
 logger = logging.getLogger(__name__)
 
 _init_lock = threading.Lock()
@@ -25,6 +36,47 @@ _application = None
 _settings: Optional[dict[str, Any]] = None
 _init_error: Optional[str] = None
 _webhook_configured = False
+_update_queue: Optional[asyncio.Queue] = None
+_consumer_future = None
+_read_buffers = threading.local()
+# Payloads handed over by request threads; the loop is woken once per burst.
+_pending_updates: deque = deque()
+_pending_lock = threading.Lock()
+_wake_scheduled = False
+
+# Updates arriving within this window are dispatched together.
+UPDATE_BATCH_SIZE = 32
+UPDATE_BATCH_WAIT = 0.005
+# How long a request thread waits for its update before acking anyway
+# (WEBHOOK_ACK_WAIT). Vercel suspends the function once it responds, so the
+# default blocks for nearly the whole update, inside vercel.json's maxDuration.
+UPDATE_ACK_WAIT = 20.0
+_ack_wait = UPDATE_ACK_WAIT
+
+
+def _path_forms(*paths: str) -> frozenset[str]:
+    """Return each path with and without a trailing slash."""
+    return frozenset(paths) | {p + "/" for p in paths if p != "/"}
+
+
+# Common Vercel paths are accepted even before settings load on first request.
+_DEFAULT_PATHS = _path_forms("/api/webhook", "/api/webhook.py", "/")
+_accepted_paths = _DEFAULT_PATHS
+
+
+def _static_response(status: int, body: bytes) -> bytes:
+    """Build a complete HTTP/1.0 response once so it can be written in one call."""
+    lines = [
+        f"HTTP/1.0 {status} {HTTPStatus(status).phrase}",
+        "Content-Type: text/plain",
+        f"Content-Length: {len(body)}",
+    ]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+_RESP_OK = _static_response(200, b"ok")
+_RESP_400 = _static_response(400, b"invalid json")
+_RESP_404 = _static_response(404, b"not found")
 
 
 def _run_in_loop(coro, timeout: float = 25.0):
@@ -33,12 +85,17 @@ def _run_in_loop(coro, timeout: float = 25.0):
     return asyncio.run_coroutine_threadsafe(coro, _event_loop).result(timeout=timeout)
 
 
-def _start_loop() -> None:
-    global _event_loop, _loop_thread
+def _start_loop(workers: int = 8) -> None:
+    global _event_loop, _loop_thread, _update_queue
     if _event_loop is not None:
         return
 
     loop = asyncio.new_event_loop()
+    # One lifecycle-managed pool for run_in_executor / to_thread on this loop.
+    loop.set_default_executor(
+        ThreadPoolExecutor(max_workers=workers, thread_name_prefix="webhook")
+    )
+    _update_queue = asyncio.Queue()
 
     def _runner() -> None:
         asyncio.set_event_loop(loop)
@@ -50,9 +107,37 @@ def _start_loop() -> None:
     _loop_thread = thread
 
 
+def _configure_paths(settings: dict[str, Any]) -> None:
+    global _accepted_paths
+    configured = str(settings.get("webhook_path") or "").rstrip("/")
+    if configured:
+        _accepted_paths = _DEFAULT_PATHS | _path_forms(configured, configured + ".py")
+
+
+def _schedule_set_webhook(application, settings: dict[str, Any]) -> None:
+    """Register the webhook in the background so cold starts do not wait on it."""
+    webhook_url = f"{settings['webhook_base'].rstrip('/')}{settings['webhook_path']}"
+
+    def _on_done(future) -> None:
+        global _webhook_configured
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            logger.error("Failed to set webhook to %s", webhook_url, exc_info=exc)
+            return
+        _webhook_configured = True
+        logger.info("Webhook set to %s", webhook_url)
+
+    future = asyncio.run_coroutine_threadsafe(
+        application.bot.set_webhook(webhook_url, drop_pending_updates=False), _event_loop
+    )
+    future.add_done_callback(_on_done)
+
+
 def _ensure_application():
     """Initialize the Telegram application once per warm instance."""
-    global _application, _settings, _init_error, _webhook_configured
+    global _application, _settings, _init_error, _ack_wait
 
     if _application is not None:
         return _application
@@ -70,19 +155,17 @@ def _ensure_application():
             from bot import build_application, load_settings
 
             settings = load_settings()
-            _start_loop()
-            application = build_application(settings["token"])
+            _start_loop(settings["workers"])
+            application = build_application(settings["token"], settings["automations_path"])
             _run_in_loop(application.initialize())
             _run_in_loop(application.start())
+            _start_consumer(application, settings["max_concurrent_updates"])
 
             if settings.get("use_webhook") and settings.get("webhook_base") and not _webhook_configured:
-                webhook_url = f"{settings['webhook_base'].rstrip('/')}{settings['webhook_path']}"
-                _run_in_loop(
-                    application.bot.set_webhook(webhook_url, drop_pending_updates=False)
-                )
-                _webhook_configured = True
-                logger.info("Webhook set to %s", webhook_url)
+                _schedule_set_webhook(application, settings)
 
+            _configure_paths(settings)
+            _ack_wait = settings["webhook_ack_wait"]
             _settings = settings
             _application = application
             return _application
@@ -92,65 +175,218 @@ def _ensure_application():
             raise RuntimeError(_init_error) from exc
 
 
-async def _process_update(payload: dict) -> None:
-    application = _ensure_application()
-    update = Update.de_json(payload, application.bot)
-    await application.process_update(update)
+def _decode_batch(batch: list, bot) -> list:
+    """Build Update objects for a batch; runs on the loop's executor."""
+    decoded = []
+    for payload, done in batch:
+        try:
+            decoded.append((Update.de_json(payload, bot), done))
+        except Exception as exc:
+            logger.exception("Failed to decode Telegram update")
+            done.set_exception(exc)
+    return decoded
+
+
+async def _next_batch() -> list:
+    """Wait for one payload, then collect whatever else arrives shortly after."""
+    loop = asyncio.get_running_loop()
+    batch = [await _update_queue.get()]
+    deadline = loop.time() + UPDATE_BATCH_WAIT
+    while len(batch) < UPDATE_BATCH_SIZE:
+        try:
+            batch.append(_update_queue.get_nowait())
+            continue
+        except asyncio.QueueEmpty:
+            pass
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(await asyncio.wait_for(_update_queue.get(), remaining))
+        except TimeoutError:
+            break
+    return batch
+
+
+async def _process_update(application, update: Update, done: Future) -> None:
+    try:
+        # Through the application's processor, so one chat's updates stay ordered.
+        await application.update_processor.process_update(
+            update, application.process_update(update)
+        )
+    except Exception as exc:
+        logger.error("Failed to process Telegram update", exc_info=exc)
+        done.set_exception(exc)
+    else:
+        done.set_result(None)
+
+
+async def _consume_updates(application, max_concurrent: int) -> None:
+    loop = asyncio.get_running_loop()
+    bot = application.bot
+    # Acquired here rather than inside the task, so a backlog waits in the
+    # queue instead of piling up as pending tasks.
+    slots = asyncio.Semaphore(max_concurrent)
+    running: set[asyncio.Task] = set()
+
+    def _finished(task: asyncio.Task) -> None:
+        running.discard(task)
+        slots.release()
+
+    while True:
+        batch = await _next_batch()
+        dispatched: set[Future] = set()
+        try:
+            # One executor hop per batch keeps object construction off the loop.
+            decoded = await loop.run_in_executor(None, _decode_batch, batch, bot)
+            for update, done in decoded:
+                await slots.acquire()
+                task = loop.create_task(_process_update(application, update, done))
+                running.add(task)
+                task.add_done_callback(_finished)
+                dispatched.add(done)
+        except BaseException as exc:
+            # Fail what this batch had not handed off yet, so those requests
+            # answer 500 and Telegram redelivers instead of a blind 200.
+            for _, done in batch:
+                if done not in dispatched and not done.done():
+                    done.set_exception(exc)
+            if not isinstance(exc, Exception):
+                raise
+            logger.exception("Failed to dispatch a batch of Telegram updates")
+
+
+def _start_consumer(application, max_concurrent: int = 32) -> None:
+    global _consumer_future
+    if _consumer_future is None:
+        _consumer_future = asyncio.run_coroutine_threadsafe(
+            _consume_updates(application, max_concurrent), _event_loop
+        )
+        _consumer_future.add_done_callback(
+            lambda future: _on_consumer_done(future, application, max_concurrent)
+        )
+
+
+def _on_consumer_done(future: Future, application, max_concurrent: int) -> None:
+    """Log and restart the consumer if it stops, so later updates are still processed."""
+    global _consumer_future
+    _consumer_future = None
+    if future.cancelled():
+        return
+    logger.error("Webhook update consumer stopped; restarting", exc_info=future.exception())
+    _start_consumer(application, max_concurrent)
+
+
+def _drain_pending_updates() -> None:
+    global _wake_scheduled
+    with _pending_lock:
+        _wake_scheduled = False
+        items = list(_pending_updates)
+        _pending_updates.clear()
+    for item in items:
+        _update_queue.put_nowait(item)
+
+
+def _dispatch_update(payload: dict) -> Future:
+    """Queue the update for the loop's consumer and return its completion future.
+
+    Only the first payload of a burst wakes the loop; later ones ride along
+    with the drain that is already scheduled.
+    """
+    global _wake_scheduled
+    done: Future = Future()
+    with _pending_lock:
+        _pending_updates.append((payload, done))
+        if _wake_scheduled:
+            return done
+        _wake_scheduled = True
+    _event_loop.call_soon_threadsafe(_drain_pending_updates)
+    return done
+
+
+def _log_slow_update(done: Future) -> None:
+    exc = done.exception()
+    if exc is not None:
+        logger.warning("Slow Telegram update failed: %s", exc)
+    else:
+        logger.warning("Slow Telegram update finished after ack")
+
+
+def _parse_body(raw_body) -> dict:
+    # orjson parses bytes directly; no separate UTF-8 decode step.
+    return loads(raw_body) if raw_body else {}
 
 
 class handler(BaseHTTPRequestHandler):
     def log_message(self, format: str, *args) -> None:
         logger.info("%s - %s", self.address_string(), format % args)
 
-    def _write_response(self, status: int, body: str, content_type: str = "text/plain") -> None:
-        encoded = body.encode()
+    def _write_response(self, status: int, body: bytes, content_type: str = "text/plain") -> None:
         self.send_response(status)
         self.send_header("Content-Type", content_type)
-        self.send_header("Content-Length", str(len(encoded)))
+        self.send_header("Content-Length", str(len(body)))
         self.end_headers()
-        self.wfile.write(encoded)
-
-    def _expected_paths(self) -> set[str]:
-        paths = {"/api/webhook", "/api/webhook.py", "/"}
-        if _settings and _settings.get("webhook_path"):
-            configured = str(_settings["webhook_path"]).rstrip("/") or "/api/webhook"
-            paths.add(configured)
-            paths.add(configured + ".py")
-        return {p.rstrip("/") or "/" for p in paths}
+        self.wfile.write(body)
+
+    def _write_error(self, exc: BaseException) -> None:
+        self._write_response(500, dumps({"error": str(exc)}), "application/json")
+
+    def _write_static(self, response: bytes) -> None:
+        self.wfile.write(response)
+        self.wfile.flush()
+
+    def _read_body(self, length: int) -> memoryview:
+        """Read the request body into a buffer reused by this server thread."""
+        if length <= 0:
+            return memoryview(b"")
+        buf = getattr(_read_buffers, "buf", None)
+        if buf is None or len(buf) < length:
+            buf = _read_buffers.buf = bytearray(max(length, 8192))
+        view = memoryview(buf)[:length]
+        read = self.rfile.readinto(view) or 0
+        return view[:read]
 
     def do_GET(self):
         # Health check should not hard-crash the function.
         try:
             _ensure_application()
-            self._write_response(200, "ok")
+            self._write_static(_RESP_OK)
         except Exception as exc:
-            self._write_response(503, f"unavailable: {exc}")
+            self._write_response(503, f"unavailable: {exc}".encode())
 
     def do_POST(self):
-        request_path = (self.path or "/").split("?", 1)[0].rstrip("/") or "/"
-        # On first request settings may be unset; allow common Vercel paths.
-        if request_path not in self._expected_paths() and request_path not in {
-            "/api/webhook",
-            "/api/webhook.py",
-            "/",
-        }:
-            self._write_response(404, "not found")
+        request_path = self.path or "/"
+        if request_path not in _accepted_paths:
+            # Slow path: strip the query string and any extra trailing slashes.
+            request_path = request_path.split("?", 1)[0].rstrip("/") or "/"
+            if request_path not in _accepted_paths:
+                self._write_static(_RESP_404)
+                return
+
+        content_length = self.headers.get("Content-Length")
+        length = int(content_length) if content_length else 0
+        raw_body = self._read_body(length)
+        try:
+            payload = _parse_body(raw_body)
+        except (json.JSONDecodeError, ValueError):
+            self._write_static(_RESP_400)
             return
 
-        length = int(self.headers.get("Content-Length", "0") or "0")
-        raw_body = self.rfile.read(length) if length > 0 else b"{}"
         try:
-            payload = json.loads(raw_body.decode() or "{}")
-        except json.JSONDecodeError:
-            self._write_response(400, "invalid json")
+            _ensure_application()
+        except Exception as exc:
+            self._write_error(exc)
             return
 
+        # Failures within the wait surface as 500 (and a Telegram retry);
+        # anything slower is acked and finishes on the loop thread.
+        done = _dispatch_update(payload)
         try:
-            _ensure_application()
-            _run_in_loop(_process_update(payload), timeout=20.0)
+            done.result(timeout=_ack_wait)
+        except FutureTimeoutError:
+            done.add_done_callback(_log_slow_update)
         except Exception as exc:
-            logger.exception("Failed to process Telegram update")
-            self._write_response(500, f"error: {exc}")
+            self._write_error(exc)
             return
+        self._write_static(_RESP_OK)
 
-        self._write_response(200, "ok")
@@ -2,19 +2,28 @@
 
 from __future__ import annotations
 
+import asyncio
+import heapq
 import html
 import logging
 import os
 import re
+import time
+from contextlib import suppress
+from dataclasses import dataclass
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from dotenv import load_dotenv
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardMarkup, Update
 from telegram.constants import ChatAction, ParseMode
+from telegram.error import BadRequest, TelegramError
 from telegram.ext import (
+    AIORateLimiter,
     Application,
+    BaseUpdateProcessor,
     CallbackQueryHandler,
     CommandHandler,
     ContextTypes,
@@ -34,6 +43,7 @@ from i18n import (
     get_period_label,
     translate,
 )
+from store import SnapshotFile, default_state_dir
 
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO
@@ -41,12 +51,18 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 AUTO_SYMBOL, AUTO_PERIOD, ALERT_TARGET = range(3)
+# bot_data keys holding per-user dicts, keyed by user id.
+USER_STORES = ("languages", "watchlists", "alerts", "automations")
 COMMAND_DELETE_SECONDS = 5
 MENU_DELETE_SECONDS = 8
 MANUAL_QUOTE_DELETE_SECONDS = 60 * 60 * 24
 WATCHLIST_LIMIT = 12
 ALERT_LIMIT = 12
 ALERT_CHECK_SECONDS = 120
+DELETION_FLUSH_SECONDS = 1
+AUTOMATION_SAVE_SECONDS = 60
+# Earliest a restored, overdue broadcast runs; the job queue must be started by then.
+AUTOMATION_RESUME_SECONDS = 10
 
 PERIOD_SECONDS = {
     "hourly": 60 * 60,
@@ -54,8 +70,17 @@ PERIOD_SECONDS = {
     "weekly": 60 * 60 * 24 * 7,
     "monthly": 60 * 60 * 24 * 30,
 }
+PERIOD_HOURS = {period: max(1, seconds // 3600) for period, seconds in PERIOD_SECONDS.items()}
+
+# Short labels for the per-automation period buttons in the manage menu.
+PERIOD_BUTTONS = (
+    ("1h", "hourly"),
+    ("1d", "daily"),
+    ("1w", "weekly"),
+    ("1m", "monthly"),
+)
 
-MENU_KEYS = [
+MENU_KEYS = (
     "menu_search",
     "menu_discover",
     "menu_watchlist",
@@ -63,11 +88,21 @@ MENU_KEYS = [
     "menu_automation",
     "menu_manage",
     "menu_settings",
-]
+)
+
+# Every translated menu label, for O(1) "is this a menu tap?" checks.
+MENU_BUTTON_TEXTS = frozenset(label for key in MENU_KEYS for label in button_labels(key))
 
 CONVERT_RE = re.compile(
     r"^\s*(?P<amount>\d+(?:\.\d+)?)\s+(?P<symbol>[A-Za-z]{2,15})\s*$"
 )
+# Automation tickers: ASCII letters and digits only, as CoinMarketCap uses.
+SYMBOL_RE = re.compile(r"[A-Z0-9]{1,15}")
+# Callback payloads: "del:<id>", "set:<id>:<period>", "lang:<code>".
+MANAGE_CALLBACK_RE = re.compile(
+    r"(del|set):(\d+)(?::(" + "|".join(map(re.escape, PERIOD_SECONDS)) + "))?"
+)
+LANGUAGE_CALLBACK_RE = re.compile(r"lang:(" + "|".join(map(re.escape, LANGUAGE_OPTIONS)) + ")")
 
 
 # ---------------------------------------------------------------------------
@@ -76,41 +111,41 @@ CONVERT_RE = re.compile(
 
 
 def get_user_language(context: ContextTypes.DEFAULT_TYPE, user_id: int) -> str:
-    store = context.application.bot_data.setdefault("languages", {})
+    store = context.application.bot_data["languages"]
     return store.get(user_id, DEFAULT_LANGUAGE)
 
 
 def set_user_language(context: ContextTypes.DEFAULT_TYPE, user_id: int, lang: str) -> str:
-    store = context.application.bot_data.setdefault("languages", {})
+    store = context.application.bot_data["languages"]
     selected = lang if lang in TEXTS else DEFAULT_LANGUAGE
     store[user_id] = selected
     return selected
 
 
-def button_regex(key: str) -> str:
+@lru_cache(maxsize=None)
+def button_regex(key: str) -> re.Pattern:
     labels = button_labels(key)
     escaped = [re.escape(label) for label in labels]
-    return "^(" + "|".join(escaped) + ")$"
+    return re.compile("^(" + "|".join(escaped) + ")$")
 
 
-def combined_button_regex(keys) -> str:
-    labels = []
-    for key in keys:
-        labels.extend(button_labels(key))
-    escaped = [re.escape(label) for label in labels]
-    return "^(" + "|".join(escaped) + ")$"
+def is_menu_button_text(text: str) -> bool:
+    return bool(text) and text in MENU_BUTTON_TEXTS
 
 
-def is_menu_button_text(text: str) -> bool:
-    if not text:
-        return False
-    labels = set()
-    for key in MENU_KEYS:
-        labels.update(button_labels(key))
-    return text in labels
+class _MenuButtonFilter(filters.MessageFilter):
+    """Matches menu button taps with a set lookup instead of a regex scan."""
 
+    __slots__ = ()
 
-def main_menu_keyboard(lang: str) -> ReplyKeyboardMarkup:
+    def filter(self, message) -> bool:
+        return message.text in MENU_BUTTON_TEXTS
+
+
+MENU_BUTTON = _MenuButtonFilter(name="MENU_BUTTON")
+
+
+def _build_main_menu_keyboard(lang: str) -> ReplyKeyboardMarkup:
     data = get_language_data(lang)
     return ReplyKeyboardMarkup(
         [
@@ -124,6 +159,14 @@ def main_menu_keyboard(lang: str) -> ReplyKeyboardMarkup:
     )
 
 
+# Attached to most replies; built once per language at import.
+MAIN_MENU_KEYBOARDS = {lang: _build_main_menu_keyboard(lang) for lang in TEXTS}
+
+
+def main_menu_keyboard(lang: str) -> ReplyKeyboardMarkup:
+    return MAIN_MENU_KEYBOARDS.get(lang) or MAIN_MENU_KEYBOARDS[DEFAULT_LANGUAGE]
+
+
 def esc(value: object) -> str:
     return html.escape("" if value is None else str(value), quote=False)
 
@@ -144,8 +187,11 @@ def format_number(value: Optional[float], prefix: str = "", decimals: int = 2) -
             return f"{prefix}{value / 1_000_000_000:,.2f}B"
         if abs_val >= 1_000_000:
             return f"{prefix}{value / 1_000_000:,.2f}M"
+        # Every caller passes decimals=0; keep its format spec constant.
+        if not decimals:
+            return f"{prefix}{value:,.0f}"
         if abs_val >= 1_000:
-            return f"{prefix}{value:,.2f}" if decimals else f"{prefix}{value:,.0f}"
+            return f"{prefix}{value:,.2f}"
         return f"{prefix}{value:,.{decimals}f}"
     except (TypeError, ValueError):
         return "?"
@@ -188,7 +234,47 @@ def change_badge(value: Optional[float]) -> str:
     return f"{arrow} {num:+.2f}%"
 
 
+QUOTE_LABEL_KEYS = (
+    "quote_change_1h",
+    "quote_change_24h",
+    "quote_change_7d",
+    "quote_change_30d",
+    "quote_marketcap",
+    "quote_volume",
+    "quote_supply",
+    "quote_fdv",
+    "quote_dominance",
+    "quote_range",
+    "quote_ath",
+)
+
+
+@lru_cache(maxsize=None)
+def quote_labels(lang: str) -> Dict[str, str]:
+    """Translated quote-card labels for ``lang``, resolved once per language."""
+    return {key: translate(lang, key) for key in QUOTE_LABEL_KEYS}
+
+
+# Rendered cards by (slug, lang). fetch_quote hands out the same dict while it
+# is memoized, so an identity match means the card is still current.
+_quote_cards: Dict[Tuple[Optional[str], str], Tuple[Dict, str]] = {}
+QUOTE_CARD_CACHE_SIZE = 1024
+
+
 def format_quote(quote: Dict, lang: str) -> str:
+    key = (quote.get("slug"), lang)
+    hit = _quote_cards.get(key)
+    if hit is not None and hit[0] is quote:
+        return hit[1]
+    text = _render_quote(quote, lang)
+    if len(_quote_cards) >= QUOTE_CARD_CACHE_SIZE:
+        _quote_cards.clear()
+    _quote_cards[key] = (quote, text)
+    return text
+
+
+def _render_quote(quote: Dict, lang: str) -> str:
+    labels = quote_labels(lang)
     stats = quote.get("stats", {}) or {}
     name = esc(quote.get("name") or "?")
     symbol = esc(quote.get("symbol") or "?")
@@ -220,31 +306,31 @@ def format_quote(quote: Dict, lang: str) -> str:
             "",
             f"💰 <b>{esc(price)}</b>",
             (
-                f"{translate(lang, 'quote_change_1h')} {esc(c1h)}"
-                f"   {translate(lang, 'quote_change_24h')} {esc(c24)}"
+                f"{labels['quote_change_1h']} {esc(c1h)}"
+                f"   {labels['quote_change_24h']} {esc(c24)}"
             ),
             (
-                f"{translate(lang, 'quote_change_7d')} {esc(c7d)}"
-                f"   {translate(lang, 'quote_change_30d')} {esc(c30)}"
+                f"{labels['quote_change_7d']} {esc(c7d)}"
+                f"   {labels['quote_change_30d']} {esc(c30)}"
             ),
             "",
-            f"📊 {translate(lang, 'quote_marketcap')}: <b>{esc(mcap)}</b>",
-            f"📦 {translate(lang, 'quote_volume')}: <b>{esc(vol)}</b>",
-            f"🏦 {translate(lang, 'quote_supply')}: <b>{esc(supply)}</b>",
+            f"📊 {labels['quote_marketcap']}: <b>{esc(mcap)}</b>",
+            f"📦 {labels['quote_volume']}: <b>{esc(vol)}</b>",
+            f"🏦 {labels['quote_supply']}: <b>{esc(supply)}</b>",
         ]
     )
     if fdv and fdv != "?":
-        lines.append(f"🧮 {translate(lang, 'quote_fdv')}: <b>{esc(fdv)}</b>")
+        lines.append(f"🧮 {labels['quote_fdv']}: <b>{esc(fdv)}</b>")
     if dominance is not None:
         try:
             lines.append(
-                f"📶 {translate(lang, 'quote_dominance')}: <b>{float(dominance):.2f}%</b>"
+                f"📶 {labels['quote_dominance']}: <b>{float(dominance):.2f}%</b>"
             )
         except (TypeError, ValueError):
             pass
-    lines.append(f"↕ {translate(lang, 'quote_range')}: <b>{esc(low)}</b> — <b>{esc(high)}</b>")
+    lines.append(f"↕ {labels['quote_range']}: <b>{esc(low)}</b> — <b>{esc(high)}</b>")
     if ath and ath != "?":
-        ath_line = f"🏆 {translate(lang, 'quote_ath')}: <b>{esc(ath)}</b>"
+        ath_line = f"🏆 {labels['quote_ath']}: <b>{esc(ath)}</b>"
         if ath_chg is not None:
             ath_line += f" ({esc(change_badge(ath_chg))})"
         lines.append(ath_line)
@@ -393,6 +479,7 @@ def build_suggestion_keyboard(suggestions: List[Dict[str, str]]) -> InlineKeyboa
     return InlineKeyboardMarkup(rows)
 
 
+@lru_cache(maxsize=len(LANGUAGE_OPTIONS) + 1)
 def build_discover_keyboard(lang: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         [
@@ -411,6 +498,7 @@ def build_discover_keyboard(lang: str) -> InlineKeyboardMarkup:
     )
 
 
+@lru_cache(maxsize=len(LANGUAGE_OPTIONS) + 1)
 def build_language_keyboard(current_lang: str) -> InlineKeyboardMarkup:
     rows = []
     for code, meta in LANGUAGE_OPTIONS.items():
@@ -435,43 +523,82 @@ def build_language_keyboard(current_lang: str) -> InlineKeyboardMarkup:
 
 
 def get_watchlist(context: ContextTypes.DEFAULT_TYPE, user_id: int) -> Dict[str, str]:
-    store = context.application.bot_data.setdefault("watchlists", {})
+    store = context.application.bot_data["watchlists"]
     return store.setdefault(user_id, {})
 
 
 def get_alerts(context: ContextTypes.DEFAULT_TYPE, user_id: int) -> Dict:
-    store = context.application.bot_data.setdefault("alerts", {})
+    store = context.application.bot_data["alerts"]
     return store.setdefault(user_id, {"counter": 1, "items": {}})
 
 
 def get_user_automations(context: ContextTypes.DEFAULT_TYPE, user_id: int) -> Dict:
-    store = context.application.bot_data.setdefault("automations", {})
-    return store.setdefault(user_id, {"counter": 1, "items": {}})
+    store = context.application.bot_data["automations"]
+    # "rendered" caches the (lang, text) of the manage list until items change.
+    return store.setdefault(user_id, {"counter": 1, "items": {}, "rendered": None})
+
+
+class DeletionBatcher:
+    """Pending message deletions, sent per chat as deleteMessages batches."""
+
+    # Telegram accepts at most 100 ids per deleteMessages call.
+    BATCH_LIMIT = 100
+
+    def __init__(self) -> None:
+        self._due: List[Tuple[float, int, int]] = []
+        # Running per-chat flushes, referenced so they are not garbage collected.
+        self._tasks: Set[asyncio.Task] = set()
+
+    def enqueue(self, chat_id: int, message_id: int, delay: float) -> None:
+        heapq.heappush(self._due, (time.monotonic() + delay, chat_id, message_id))
+
+    def pop_due(self) -> Dict[int, List[int]]:
+        now = time.monotonic()
+        by_chat: Dict[int, List[int]] = {}
+        while self._due and self._due[0][0] <= now:
+            _, chat_id, message_id = heapq.heappop(self._due)
+            by_chat.setdefault(chat_id, []).append(message_id)
+        return by_chat
+
+    def flush(self, bot) -> None:
+        """Start one task per chat, so a rate-limited chat cannot hold up the rest."""
+        for chat_id, message_ids in self.pop_due().items():
+            task = asyncio.create_task(self._flush_chat(bot, chat_id, message_ids))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _flush_chat(self, bot, chat_id: int, message_ids: List[int]) -> None:
+        for start in range(0, len(message_ids), self.BATCH_LIMIT):
+            batch = message_ids[start : start + self.BATCH_LIMIT]
+            try:
+                await bot.delete_messages(chat_id=chat_id, message_ids=batch)
+            except BadRequest:
+                # One undeletable message fails the whole call; retry singly.
+                for message_id in batch:
+                    try:
+                        await bot.delete_message(chat_id=chat_id, message_id=message_id)
+                    except TelegramError as exc:
+                        logger.debug(
+                            "delete_message failed for %s:%s -> %s", chat_id, message_id, exc
+                        )
+            except TelegramError as exc:
+                logger.debug("delete_messages failed for %s -> %s", chat_id, exc)
+
+
+DELETIONS = DeletionBatcher()
 
 
 def schedule_delete_message(
     job_queue: Optional[JobQueue], chat_id: int, message_id: int, delay: int
 ) -> None:
+    # Deletions are flushed by a job, so without a job queue nothing would run.
     if not job_queue:
         return
-    job_queue.run_once(
-        delete_message_job,
-        when=delay,
-        data={"chat_id": chat_id, "message_id": message_id},
-        name=f"del-{chat_id}-{message_id}",
-    )
+    DELETIONS.enqueue(chat_id, message_id, delay)
 
 
-async def delete_message_job(context: ContextTypes.DEFAULT_TYPE) -> None:
-    data = context.job.data or {}
-    chat_id = data.get("chat_id")
-    message_id = data.get("message_id")
-    if not chat_id or not message_id:
-        return
-    try:
-        await context.bot.delete_message(chat_id=chat_id, message_id=message_id)
-    except Exception as exc:
-        logger.debug("delete_message_job failed for %s:%s -> %s", chat_id, message_id, exc)
+async def flush_deletions_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    DELETIONS.flush(context.bot)
 
 
 def maybe_delete_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -484,6 +611,16 @@ def maybe_delete_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         )
 
 
+async def reply_temporarily(
+    query, context: ContextTypes.DEFAULT_TYPE, text: str, delay: int, **kwargs
+) -> None:
+    """Reply under a callback's message and schedule the reply's deletion."""
+    if not query.message:
+        return
+    msg = await query.message.reply_text(text, parse_mode=ParseMode.HTML, **kwargs)
+    schedule_delete_message(context.job_queue, msg.chat_id, msg.message_id, delay)
+
+
 # ---------------------------------------------------------------------------
 # Core quote flow
 # ---------------------------------------------------------------------------
@@ -495,6 +632,7 @@ async def send_quote_for_symbol(
     symbol: str,
     *,
     edit_message=None,
+    fresh: bool = False,
 ) -> None:
     lang = get_user_language(context, update.effective_user.id)
     client: CoinMarketCapClient = context.bot_data["cmc_client"]
@@ -508,9 +646,9 @@ async def send_quote_for_symbol(
         except Exception:
             pass
 
-    slug = client.resolve_symbol(symbol)
+    slug = await client.resolve_symbol(symbol)
     if not slug:
-        suggestions = client.suggest_symbols(symbol)
+        suggestions = await client.suggest_symbols(symbol)
         text = translate(lang, "symbol_not_found" if suggestions else "symbol_not_found_plain", symbol=esc(symbol))
         markup = build_suggestion_keyboard(suggestions) if suggestions else None
         if edit_message:
@@ -525,7 +663,7 @@ async def send_quote_for_symbol(
             )
         return
 
-    quote = client.fetch_quote(slug)
+    quote = await client.fetch_quote(slug, fresh=fresh)
     if not quote or "stats" not in quote or quote["stats"].get("price") is None:
         text = translate(lang, "manual_fetch_fail")
         if edit_message:
@@ -539,7 +677,12 @@ async def send_quote_for_symbol(
     markup = build_quote_actions_keyboard(slug, quote.get("id"), symbol, lang, watched=watched)
 
     if edit_message:
-        await edit_message.edit_text(text, parse_mode=ParseMode.HTML, reply_markup=markup)
+        try:
+            await edit_message.edit_text(text, parse_mode=ParseMode.HTML, reply_markup=markup)
+        except BadRequest as exc:
+            # The price has not moved since the card was rendered.
+            if "not modified" not in str(exc).lower():
+                raise
         return
 
     msg = await update.effective_message.reply_text(
@@ -619,18 +762,18 @@ async def discover_callback(update: Update, context: ContextTypes.DEFAULT_TYPE)
     client: CoinMarketCapClient = context.bot_data["cmc_client"]
 
     if kind == "gainers":
-        items = client.fetch_movers("percent_change_24h", limit=10)
+        items = await client.fetch_movers("percent_change_24h", limit=10)
         text = format_movers(items, lang, "gainers_header")
     elif kind == "losers":
-        items = client.fetch_movers("percent_change_24h:asc", limit=10)
+        items = await client.fetch_movers("percent_change_24h:asc", limit=10)
         text = format_movers(items, lang, "losers_header")
     elif kind == "trending":
-        items = client.fetch_movers("volume_24h", limit=10)
+        items = await client.fetch_movers("volume_24h", limit=10)
         text = format_movers(items, lang, "trending_header")
     else:
-        items = client.get_cached_listing(limit=10)
+        items = await client.get_cached_listing(limit=10)
         if not items:
-            items = client.fetch_movers("market_cap", limit=10)
+            items = await client.fetch_movers("market_cap", limit=10)
         text = format_movers(items, lang, "top_header")
 
     # Quick-open buttons for top 5
@@ -644,17 +787,14 @@ async def discover_callback(update: Update, context: ContextTypes.DEFAULT_TYPE)
     rows.append(
         [InlineKeyboardButton(translate(lang, "cancel_button"), callback_data="cancel:discover")]
     )
-    if query.message:
-        msg = await query.message.reply_text(
-            text,
-            parse_mode=ParseMode.HTML,
-            reply_markup=InlineKeyboardMarkup(rows),
-            disable_web_page_preview=True,
-        )
-        if msg:
-            schedule_delete_message(
-                context.job_queue, msg.chat_id, msg.message_id, MANUAL_QUOTE_DELETE_SECONDS
-            )
+    await reply_temporarily(
+        query,
+        context,
+        text,
+        MANUAL_QUOTE_DELETE_SECONDS,
+        reply_markup=InlineKeyboardMarkup(rows),
+        disable_web_page_preview=True,
+    )
 
 
 async def price_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -676,12 +816,15 @@ async def compare_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         return
 
     client: CoinMarketCapClient = context.bot_data["cmc_client"]
-    quotes = []
+    slugs = []
     for symbol in symbols:
-        slug = client.resolve_symbol(symbol)
-        if not slug:
-            continue
-        quote = client.fetch_quote(slug)
+        slug = await client.resolve_symbol(symbol)
+        if slug:
+            slugs.append(slug)
+    fetched = await client.fetch_quotes(slugs)
+    quotes = []
+    for slug in slugs:
+        quote = fetched[slug]
         if quote and quote.get("stats", {}).get("price") is not None:
             quotes.append(quote)
 
@@ -722,14 +865,14 @@ async def _send_conversion(
 ) -> None:
     lang = get_user_language(context, update.effective_user.id)
     client: CoinMarketCapClient = context.bot_data["cmc_client"]
-    slug = client.resolve_symbol(symbol)
+    slug = await client.resolve_symbol(symbol)
     if not slug:
         await update.effective_message.reply_text(
             translate(lang, "symbol_not_found_plain", symbol=esc(symbol)),
             parse_mode=ParseMode.HTML,
         )
         return
-    quote = client.fetch_quote(slug)
+    quote = await client.fetch_quote(slug)
     price = (quote or {}).get("stats", {}).get("price")
     if price is None:
         await update.effective_message.reply_text(
@@ -772,8 +915,10 @@ async def watchlist_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     client: CoinMarketCapClient = context.bot_data["cmc_client"]
     lines = [translate(lang, "watchlist_header", count=len(watchlist)), ""]
     rows = []
-    for symbol, slug in list(watchlist.items())[:WATCHLIST_LIMIT]:
-        quote = client.fetch_quote(slug)
+    entries = list(watchlist.items())[:WATCHLIST_LIMIT]
+    quotes = await client.fetch_quotes(slug for _, slug in entries)
+    for symbol, slug in entries:
+        quote = quotes[slug]
         stats = (quote or {}).get("stats") or {}
         lines.append(
             "• <b>{sym}</b> {price} · 24h {chg}".format(
@@ -798,7 +943,7 @@ async def watch_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         await watchlist_command(update, context)
         return
     symbol = context.args[0].upper()
-    text = _add_watch(context, update.effective_user.id, symbol, lang)
+    text = await _add_watch(context, update.effective_user.id, symbol, lang)
     await update.message.reply_text(text, parse_mode=ParseMode.HTML)
 
 
@@ -813,9 +958,9 @@ async def unwatch_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     await update.message.reply_text(text, parse_mode=ParseMode.HTML)
 
 
-def _add_watch(context: ContextTypes.DEFAULT_TYPE, user_id: int, symbol: str, lang: str) -> str:
+async def _add_watch(context: ContextTypes.DEFAULT_TYPE, user_id: int, symbol: str, lang: str) -> str:
     client: CoinMarketCapClient = context.application.bot_data["cmc_client"]
-    slug = client.resolve_symbol(symbol)
+    slug = await client.resolve_symbol(symbol)
     if not slug:
         return translate(lang, "symbol_not_found_plain", symbol=esc(symbol))
     watchlist = get_watchlist(context, user_id)
@@ -840,7 +985,7 @@ def _remove_watch(context: ContextTypes.DEFAULT_TYPE, user_id: int, symbol: str,
 # ---------------------------------------------------------------------------
 
 
-def _create_alert(
+async def _create_alert(
     context: ContextTypes.DEFAULT_TYPE,
     user_id: int,
     chat_id: int,
@@ -850,7 +995,7 @@ def _create_alert(
     lang: str,
 ) -> str:
     client: CoinMarketCapClient = context.application.bot_data["cmc_client"]
-    slug = client.resolve_symbol(symbol)
+    slug = await client.resolve_symbol(symbol)
     if not slug:
         return translate(lang, "symbol_not_found_plain", symbol=esc(symbol))
     if direction not in {"above", "below"}:
@@ -950,7 +1095,7 @@ async def alert_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         direction = "above"
     if direction in {"down", "under", "<"}:
         direction = "below"
-    text = _create_alert(
+    text = await _create_alert(
         context, update.effective_user.id, update.effective_chat.id, symbol, target, direction, lang
     )
     await update.message.reply_text(text, parse_mode=ParseMode.HTML)
@@ -981,7 +1126,7 @@ async def alert_target_message(update: Update, context: ContextTypes.DEFAULT_TYP
         direction = "above"
     if direction in {"down", "under", "<"}:
         direction = "below"
-    text = _create_alert(
+    text = await _create_alert(
         context, update.effective_user.id, update.effective_chat.id, symbol, target, direction, lang
     )
     context.user_data.pop("alert_symbol", None)
@@ -989,13 +1134,24 @@ async def alert_target_message(update: Update, context: ContextTypes.DEFAULT_TYP
     return ConversationHandler.END
 
 
+async def refresh_symbols_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    client: CoinMarketCapClient = context.application.bot_data["cmc_client"]
+    await client.refresh_symbols()
+
+
 async def check_price_alerts(context: ContextTypes.DEFAULT_TYPE) -> None:
     client: CoinMarketCapClient = context.application.bot_data["cmc_client"]
-    all_alerts: Dict = context.application.bot_data.get("alerts") or {}
+    all_alerts: Dict = context.application.bot_data["alerts"]
+    # One concurrent round of quotes for every watched slug, then check alerts.
+    quotes = await client.fetch_quotes(
+        item["slug"]
+        for bucket in all_alerts.values()
+        for item in bucket.get("items", {}).values()
+    )
     for user_id, bucket in list(all_alerts.items()):
         lang = get_user_language(context, user_id)
         for alert_id, item in list(bucket.get("items", {}).items()):
-            quote = client.fetch_quote(item["slug"])
+            quote = quotes.get(item["slug"])
             price = (quote or {}).get("stats", {}).get("price")
             if price is None:
                 continue
@@ -1050,9 +1206,11 @@ async def refresh_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     await query.answer(translate(lang, "refreshed"))
     slug = (query.data or "").split(":", 1)[-1]
     client: CoinMarketCapClient = context.bot_data["cmc_client"]
-    symbol = client.symbol_for_slug(slug) or slug.upper().replace("-", "")
+    symbol = await client.symbol_for_slug(slug) or slug.upper().replace("-", "")
     if query.message:
-        await send_quote_for_symbol(update, context, symbol, edit_message=query.message)
+        await send_quote_for_symbol(
+            update, context, symbol, edit_message=query.message, fresh=True
+        )
 
 
 async def watch_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -1061,15 +1219,15 @@ async def watch_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     action, symbol = (query.data or "watch:").split(":", 1)
     symbol = symbol.upper()
     if action == "watch":
-        text = _add_watch(context, query.from_user.id, symbol, lang)
+        text = await _add_watch(context, query.from_user.id, symbol, lang)
     else:
         text = _remove_watch(context, query.from_user.id, symbol, lang)
     await query.answer(re.sub("<[^>]+>", "", text)[:180])
     # Refresh keyboard state on the quote message if possible
     if query.message and query.message.reply_markup:
         client: CoinMarketCapClient = context.bot_data["cmc_client"]
-        slug = client.resolve_symbol(symbol) or ""
-        quote = client.fetch_quote(slug) if slug else None
+        slug = await client.resolve_symbol(symbol) or ""
+        quote = await client.fetch_quote(slug) if slug else None
         if quote:
             watched = symbol in get_watchlist(context, query.from_user.id)
             await query.message.edit_reply_markup(
@@ -1119,17 +1277,14 @@ async def markets_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     await query.answer()
     slug = (query.data or "").split(":", 1)[-1] or None
     client: CoinMarketCapClient = context.bot_data["cmc_client"]
-    markets = client.fetch_markets(slug) if slug else []
-    if query.message:
-        msg = await query.message.reply_text(
-            format_markets(markets, lang),
-            parse_mode=ParseMode.HTML,
-            disable_web_page_preview=True,
-        )
-        if msg:
-            schedule_delete_message(
-                context.job_queue, msg.chat_id, msg.message_id, MANUAL_QUOTE_DELETE_SECONDS
-            )
+    markets = await client.fetch_markets(slug) if slug else []
+    await reply_temporarily(
+        query,
+        context,
+        format_markets(markets, lang),
+        MANUAL_QUOTE_DELETE_SECONDS,
+        disable_web_page_preview=True,
+    )
 
 
 async def news_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -1144,15 +1299,10 @@ async def news_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         except ValueError:
             coin_id = None
     client: CoinMarketCapClient = context.bot_data["cmc_client"]
-    text = format_news(client.fetch_news(coin_id), lang)
-    if query.message:
-        msg = await query.message.reply_text(
-            text, parse_mode=ParseMode.HTML, disable_web_page_preview=True
-        )
-        if msg:
-            schedule_delete_message(
-                context.job_queue, msg.chat_id, msg.message_id, MANUAL_QUOTE_DELETE_SECONDS
-            )
+    text = format_news(await client.fetch_news(coin_id), lang)
+    await reply_temporarily(
+        query, context, text, MANUAL_QUOTE_DELETE_SECONDS, disable_web_page_preview=True
+    )
 
 
 async def predictions_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -1161,15 +1311,10 @@ async def predictions_callback(update: Update, context: ContextTypes.DEFAULT_TYP
     await query.answer()
     slug = (query.data or "").split(":", 1)[-1] or None
     client: CoinMarketCapClient = context.bot_data["cmc_client"]
-    text = format_predictions(client.fetch_predictions(slug), lang)
-    if query.message:
-        msg = await query.message.reply_text(
-            text, parse_mode=ParseMode.HTML, disable_web_page_preview=True
-        )
-        if msg:
-            schedule_delete_message(
-                context.job_queue, msg.chat_id, msg.message_id, MANUAL_QUOTE_DELETE_SECONDS
-            )
+    text = format_predictions(await client.fetch_predictions(slug), lang)
+    await reply_temporarily(
+        query, context, text, MANUAL_QUOTE_DELETE_SECONDS, disable_web_page_preview=True
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -1177,6 +1322,21 @@ async def predictions_callback(update: Update, context: ContextTypes.DEFAULT_TYP
 # ---------------------------------------------------------------------------
 
 
+@dataclass(slots=True, eq=False)
+class Automation:
+    """A scheduled quote broadcast owned by one user.
+
+    Compared by identity so it can sit in its broadcast job's subscriber set.
+    """
+
+    user_id: int
+    chat_id: int
+    slug: str
+    symbol: str
+    period: str
+    job: Any
+
+
 def schedule_automation(
     context: ContextTypes.DEFAULT_TYPE,
     user_id: int,
@@ -1184,73 +1344,177 @@ def schedule_automation(
     slug: str,
     symbol: str,
     period: str,
+    automation_id: Optional[int] = None,
+    first: Optional[float] = None,
 ) -> int:
+    """Subscribe a chat to a (slug, period) broadcast; ``first`` applies if the job is new."""
     automations = get_user_automations(context, user_id)
-    automation_id = automations["counter"]
-    automations["counter"] += 1
-    interval = PERIOD_SECONDS[period]
-    job = context.job_queue.run_repeating(
-        send_automation_update,
-        interval=interval,
-        data={"slug": slug, "symbol": symbol, "user_id": user_id, "period": period},
-        chat_id=chat_id,
-        name=f"auto-{user_id}-{automation_id}",
-    )
-    automations["items"][automation_id] = {
-        "slug": slug,
-        "symbol": symbol,
-        "period": period,
-        "job": job,
-    }
+    if automation_id is None:
+        automation_id = automations["counter"]
+    automations["counter"] = max(automations["counter"], automation_id + 1)
+    # One repeating job per (slug, period) serves every subscriber.
+    broadcasts = context.application.bot_data["broadcasts"]
+    job = broadcasts.get((slug, period))
+    if job is None:
+        job = context.job_queue.run_repeating(
+            send_automation_update,
+            interval=PERIOD_SECONDS[period],
+            first=first,
+            data={"slug": slug, "period": period, "subscribers": set()},
+            name=f"auto-{slug}-{period}",
+        )
+        broadcasts[(slug, period)] = job
+    item = Automation(user_id, chat_id, slug, symbol, period, job)
+    job.data["subscribers"].add(item)
+    automations["items"][automation_id] = item
+    automations["rendered"] = None
     return automation_id
 
 
 def cancel_automation(context: ContextTypes.DEFAULT_TYPE, user_id: int, automation_id: int) -> bool:
     automations = get_user_automations(context, user_id)
     item = automations["items"].pop(automation_id, None)
-    if item:
-        item["job"].schedule_removal()
-        return True
-    return False
+    if not item:
+        return False
+    automations["rendered"] = None
+    subscribers = item.job.data["subscribers"]
+    subscribers.discard(item)
+    if not subscribers:
+        item.job.schedule_removal()
+        context.application.bot_data["broadcasts"].pop((item.slug, item.period), None)
+    return True
+
+
+def _next_run(job) -> Optional[float]:
+    try:
+        next_t = job.next_t
+    except AttributeError:
+        # The job queue has not started yet.
+        return None
+    return next_t.timestamp() if next_t else None
+
+
+def snapshot_automations(bot_data: Dict) -> Dict:
+    """Plain-data view of every user's automations, without the job objects."""
+    next_runs = {key: _next_run(job) for key, job in bot_data["broadcasts"].items()}
+    return {
+        user_id: {
+            "counter": bucket["counter"],
+            "items": {
+                automation_id: {
+                    "chat_id": item.chat_id,
+                    "slug": item.slug,
+                    "symbol": item.symbol,
+                    "period": item.period,
+                    "next_run": next_runs.get((item.slug, item.period)),
+                }
+                for automation_id, item in bucket["items"].items()
+            },
+        }
+        for user_id, bucket in bot_data["automations"].items()
+        if bucket["items"]
+    }
+
+
+def restore_automations(context: ContextTypes.DEFAULT_TYPE, saved: Optional[Dict]) -> None:
+    """Re-schedule automations from a snapshot_automations() result.
+
+    Broadcasts resume at their saved next run, so restarts more frequent than
+    the period do not keep pushing it back.
+    """
+    restored = 0
+    now = time.time()
+    for user_key, bucket in (saved or {}).items():
+        try:
+            user_id = int(user_key)
+            for automation_key, item in bucket["items"].items():
+                if item["period"] not in PERIOD_SECONDS:
+                    continue
+                next_run = item.get("next_run")
+                first = (
+                    None
+                    if next_run is None
+                    else max(float(next_run) - now, AUTOMATION_RESUME_SECONDS)
+                )
+                schedule_automation(
+                    context,
+                    user_id,
+                    item["chat_id"],
+                    item["slug"],
+                    item["symbol"],
+                    item["period"],
+                    automation_id=int(automation_key),
+                    first=first,
+                )
+                restored += 1
+            automations = get_user_automations(context, user_id)
+            automations["counter"] = max(automations["counter"], int(bucket["counter"]))
+        except (KeyError, TypeError, ValueError, AttributeError) as exc:
+            logger.warning("Skipping saved automations for %s: %s", user_key, exc)
+    if restored:
+        logger.info("Restored %s automations", restored)
+
+
+async def save_automations_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    bot_data = context.application.bot_data
+    snapshot: SnapshotFile = bot_data["automation_snapshot"]
+    await asyncio.to_thread(snapshot.save, snapshot_automations(bot_data))
 
 
 async def send_automation_update(context: ContextTypes.DEFAULT_TYPE) -> None:
-    data = context.job.data or {}
-    slug = data.get("slug")
-    symbol = data.get("symbol")
-    period = data.get("period")
-    user_id = data.get("user_id")
-    lang = get_user_language(context, user_id) if user_id else DEFAULT_LANGUAGE
-    period_label = get_period_label(lang, period) if period else period
+    data = context.job.data
     client: CoinMarketCapClient = context.application.bot_data["cmc_client"]
-    quote = client.fetch_quote(slug) if slug else None
+    quote = await client.fetch_quote(data["slug"])
     if not quote or "stats" not in quote or quote["stats"].get("price") is None:
-        msg = await context.bot.send_message(
-            chat_id=context.job.chat_id,
-            text=translate(lang, "fetch_unavailable", symbol=esc(symbol)),
-            parse_mode=ParseMode.HTML,
-        )
-        if msg:
-            schedule_delete_message(
-                context.job_queue, msg.chat_id, msg.message_id, PERIOD_SECONDS.get(period, 3600)
+        quote = None
+    # Rendered quote cards by language, shared by all subscribers of this tick.
+    bodies: Dict[str, str] = {}
+    await asyncio.gather(
+        *(_send_automation(context, item, quote, bodies) for item in list(data["subscribers"]))
+    )
+
+
+async def _send_automation(
+    context: ContextTypes.DEFAULT_TYPE,
+    item: Automation,
+    quote: Optional[Dict],
+    bodies: Dict[str, str],
+) -> None:
+    lang = get_user_language(context, item.user_id)
+    try:
+        if quote is None:
+            msg = await context.bot.send_message(
+                chat_id=item.chat_id,
+                text=translate(lang, "fetch_unavailable", symbol=esc(item.symbol)),
+                parse_mode=ParseMode.HTML,
+            )
+        else:
+            body = bodies.get(lang)
+            if body is None:
+                period_label = get_period_label(lang, item.period)
+                body = bodies[lang] = (
+                    f"{translate(lang, 'automation_prefix', period=esc(period_label))}\n"
+                    f"{format_quote(quote, lang)}"
+                )
+            msg = await context.bot.send_message(
+                chat_id=item.chat_id,
+                text=body,
+                parse_mode=ParseMode.HTML,
+                reply_markup=build_quote_actions_keyboard(
+                    item.slug,
+                    quote.get("id"),
+                    item.symbol,
+                    lang,
+                    watched=item.symbol in get_watchlist(context, item.user_id),
+                ),
+                disable_web_page_preview=True,
             )
+    except TelegramError as exc:
+        logger.warning("Failed sending automation to %s: %s", item.chat_id, exc)
         return
-
-    watched = False
-    if user_id:
-        watched = symbol in get_watchlist(context, user_id)
-    msg = await context.bot.send_message(
-        chat_id=context.job.chat_id,
-        text=f"{translate(lang, 'automation_prefix', period=esc(period_label))}\n{format_quote(quote, lang)}",
-        parse_mode=ParseMode.HTML,
-        reply_markup=build_quote_actions_keyboard(
-            slug or "", quote.get("id"), symbol or "", lang, watched=watched
-        ),
-        disable_web_page_preview=True,
-    )
     if msg:
         schedule_delete_message(
-            context.job_queue, msg.chat_id, msg.message_id, PERIOD_SECONDS.get(period, 3600)
+            context.job_queue, msg.chat_id, msg.message_id, PERIOD_SECONDS[item.period]
         )
 
 
@@ -1274,17 +1538,40 @@ async def automation_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     return AUTO_SYMBOL
 
 
+@lru_cache(maxsize=None)
+def build_frequency_keyboard(lang: str) -> InlineKeyboardMarkup:
+    # Identical for every user of a language; PTB markup objects are immutable.
+    keyboard = [
+        [
+            InlineKeyboardButton(
+                f"⏱️ {get_period_label(lang, 'hourly')}", callback_data="new:hourly"
+            ),
+            InlineKeyboardButton(f"☀️ {get_period_label(lang, 'daily')}", callback_data="new:daily"),
+        ],
+        [
+            InlineKeyboardButton(
+                f"📅 {get_period_label(lang, 'weekly')}", callback_data="new:weekly"
+            ),
+            InlineKeyboardButton(
+                f"🗓️ {get_period_label(lang, 'monthly')}", callback_data="new:monthly"
+            ),
+        ],
+        [InlineKeyboardButton(translate(lang, "cancel_button"), callback_data="cancel:auto")],
+    ]
+    return InlineKeyboardMarkup(keyboard)
+
+
 async def automation_symbol(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     client: CoinMarketCapClient = context.bot_data["cmc_client"]
     lang = get_user_language(context, update.effective_user.id)
     symbol = (update.message.text or "").strip().upper()
-    if not symbol.isalnum():
+    if not SYMBOL_RE.fullmatch(symbol):
         await update.message.reply_text(
             translate(lang, "invalid_symbol"), parse_mode=ParseMode.HTML
         )
         return AUTO_SYMBOL
 
-    slug = client.resolve_symbol(symbol)
+    slug = await client.resolve_symbol(symbol)
     if not slug:
         await update.message.reply_text(
             translate(lang, "symbol_not_found_plain", symbol=esc(symbol)),
@@ -1294,27 +1581,10 @@ async def automation_symbol(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
     context.user_data["auto_symbol"] = symbol
     context.user_data["auto_slug"] = slug
-    keyboard = [
-        [
-            InlineKeyboardButton(
-                f"⏱️ {get_period_label(lang, 'hourly')}", callback_data="new:hourly"
-            ),
-            InlineKeyboardButton(f"☀️ {get_period_label(lang, 'daily')}", callback_data="new:daily"),
-        ],
-        [
-            InlineKeyboardButton(
-                f"📅 {get_period_label(lang, 'weekly')}", callback_data="new:weekly"
-            ),
-            InlineKeyboardButton(
-                f"🗓️ {get_period_label(lang, 'monthly')}", callback_data="new:monthly"
-            ),
-        ],
-        [InlineKeyboardButton(translate(lang, "cancel_button"), callback_data="cancel:auto")],
-    ]
     await update.message.reply_text(
         translate(lang, "choose_frequency", symbol=esc(symbol)),
         parse_mode=ParseMode.HTML,
-        reply_markup=InlineKeyboardMarkup(keyboard),
+        reply_markup=build_frequency_keyboard(lang),
     )
     return AUTO_PERIOD
 
@@ -1357,39 +1627,64 @@ async def automation_period_selection(update: Update, context: ContextTypes.DEFA
     return ConversationHandler.END
 
 
+@lru_cache(maxsize=1024)
+def period_row(automation_id: int) -> Tuple[InlineKeyboardButton, ...]:
+    # Same for every language, so it only depends on the automation id.
+    return tuple(
+        InlineKeyboardButton(label, callback_data=f"set:{automation_id}:{period}")
+        for label, period in PERIOD_BUTTONS
+    )
+
+
 def build_manage_keyboard(
     user_id: int, context: ContextTypes.DEFAULT_TYPE, lang: str
 ) -> InlineKeyboardMarkup:
     automations = get_user_automations(context, user_id)
-    rows = []
-    for automation_id, item in automations["items"].items():
-        rows.append(
+    rows = [
+        row
+        for automation_id, item in automations["items"].items()
+        for row in (
             [
                 InlineKeyboardButton(
                     translate(
                         lang,
                         "delete_button",
                         automation_id=automation_id,
-                        symbol=item["symbol"],
+                        symbol=item.symbol,
                     ),
                     callback_data=f"del:{automation_id}",
                 )
-            ]
-        )
-        rows.append(
-            [
-                InlineKeyboardButton("1h", callback_data=f"set:{automation_id}:hourly"),
-                InlineKeyboardButton("1d", callback_data=f"set:{automation_id}:daily"),
-                InlineKeyboardButton("1w", callback_data=f"set:{automation_id}:weekly"),
-                InlineKeyboardButton("1m", callback_data=f"set:{automation_id}:monthly"),
-            ]
+            ],
+            period_row(automation_id),
         )
+    ]
     rows.append(
         [InlineKeyboardButton(translate(lang, "cancel_button"), callback_data="cancel:manage")]
     )
     return InlineKeyboardMarkup(rows)
 
 
+def render_automation_list(automations: Dict, lang: str) -> str:
+    cached = automations["rendered"]
+    if cached is not None and cached[0] == lang:
+        return cached[1]
+    lines = [translate(lang, "automation_list_header")]
+    for automation_id, item in automations["items"].items():
+        lines.append(
+            translate(
+                lang,
+                "automation_line",
+                automation_id=automation_id,
+                symbol=esc(item.symbol),
+                period=get_period_label(lang, item.period),
+                every_hours=PERIOD_HOURS[item.period],
+            )
+        )
+    text = "\n".join(lines)
+    automations["rendered"] = (lang, text)
+    return text
+
+
 async def manage_automation(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     lang = get_user_language(context, update.effective_user.id)
     if update.message:
@@ -1409,21 +1704,8 @@ async def manage_automation(update: Update, context: ContextTypes.DEFAULT_TYPE)
         )
         return
 
-    lines = [translate(lang, "automation_list_header")]
-    for automation_id, item in automations["items"].items():
-        hours = max(1, PERIOD_SECONDS[item["period"]] // 3600)
-        lines.append(
-            translate(
-                lang,
-                "automation_line",
-                automation_id=automation_id,
-                symbol=esc(item["symbol"]),
-                period=get_period_label(lang, item["period"]),
-                every_hours=hours,
-            )
-        )
     await update.message.reply_text(
-        "\n".join(lines),
+        render_automation_list(automations, lang),
         parse_mode=ParseMode.HTML,
         reply_markup=build_manage_keyboard(update.effective_user.id, context, lang),
     )
@@ -1433,15 +1715,14 @@ async def manage_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     query = update.callback_query
     lang = get_user_language(context, query.from_user.id)
     await query.answer()
-    parts = (query.data or "").split(":")
-    if len(parts) < 2:
+    # Every branch replies under the menu message; inline or inaccessible ones have none.
+    if not query.message:
         return
-    action = parts[0]
-    try:
-        automation_id = int(parts[1])
-    except ValueError:
+    match = MANAGE_CALLBACK_RE.fullmatch(query.data or "")
+    if not match:
         await query.message.reply_text(translate(lang, "invalid_id"), parse_mode=ParseMode.HTML)
         return
+    action, automation_id, period = match[1], int(match[2]), match[3]
 
     if action == "del":
         ok = cancel_automation(context, query.from_user.id, automation_id)
@@ -1453,9 +1734,8 @@ async def manage_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         await query.message.reply_text(text, parse_mode=ParseMode.HTML)
         return
 
-    if action == "set" and len(parts) == 3:
-        period = parts[2]
-        if period not in PERIOD_SECONDS:
+    if action == "set":
+        if period is None:
             await query.message.reply_text(
                 translate(lang, "invalid_period"), parse_mode=ParseMode.HTML
             )
@@ -1468,19 +1748,16 @@ async def manage_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             )
             return
         cancel_automation(context, query.from_user.id, automation_id)
-        # Preserve id by manually reinserting with same id
-        new_id = schedule_automation(
+        # Reschedule under the same id so existing references stay valid.
+        schedule_automation(
             context,
             query.from_user.id,
             query.message.chat_id,
-            item["slug"],
-            item["symbol"],
+            item.slug,
+            item.symbol,
             period,
+            automation_id=automation_id,
         )
-        # Move to original id for stable references
-        created = automations["items"].pop(new_id)
-        automations["items"][automation_id] = created
-        automations["counter"] = max(automations["counter"], automation_id + 1)
         await query.message.reply_text(
             translate(
                 lang,
@@ -1508,13 +1785,13 @@ async def settings_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
 async def language_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     query = update.callback_query
     await query.answer()
-    parts = (query.data or "").split(":", 1)
-    if len(parts) != 2 or parts[1] not in LANGUAGE_OPTIONS:
+    match = LANGUAGE_CALLBACK_RE.fullmatch(query.data or "")
+    if not match:
         await query.edit_message_text(
             translate(DEFAULT_LANGUAGE, "invalid_language"), parse_mode=ParseMode.HTML
         )
         return
-    lang = set_user_language(context, query.from_user.id, parts[1])
+    lang = set_user_language(context, query.from_user.id, match[1])
     meta = LANGUAGE_OPTIONS[lang]
     await query.edit_message_text(
         translate(
@@ -1541,12 +1818,10 @@ async def cancel_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
     context.user_data.pop("auto_symbol", None)
     context.user_data.pop("auto_slug", None)
     if query.message:
-        try:
+        with suppress(TelegramError):
             await context.bot.delete_message(
                 chat_id=query.message.chat_id, message_id=query.message.message_id
             )
-        except Exception:
-            pass
         ack = await context.bot.send_message(
             chat_id=query.message.chat_id,
             text=translate(lang, "cancelled"),
@@ -1609,11 +1884,99 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
 # ---------------------------------------------------------------------------
 
 
-def build_application(token: str) -> Application:
+class PerChatUpdateProcessor(BaseUpdateProcessor):
+    """Processes updates concurrently, but one at a time per chat.
+
+    ConversationHandler state is read and written around each callback, so
+    two updates from the same chat must not interleave (e.g. a double tap on
+    a period button would schedule the automation twice).
+    """
+
+    __slots__ = ("_chat_locks",)
+
+    def __init__(self, max_concurrent_updates: int):
+        super().__init__(max_concurrent_updates)
+        # chat/user id -> [lock, number of updates holding or waiting on it]
+        self._chat_locks: Dict[int, List[Any]] = {}
+
+    async def do_process_update(self, update: object, coroutine) -> None:
+        key = None
+        if isinstance(update, Update):
+            if update.effective_chat:
+                key = update.effective_chat.id
+            elif update.effective_user:
+                key = update.effective_user.id
+        if key is None:
+            await coroutine
+            return
+        entry = self._chat_locks.get(key)
+        if entry is None:
+            entry = self._chat_locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                await coroutine
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._chat_locks[key]
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+
+async def close_cmc_client(application: Application) -> None:
+    client: Optional[CoinMarketCapClient] = application.bot_data.get("cmc_client")
+    if client:
+        await client.aclose()
+
+
+async def on_shutdown(application: Application) -> None:
+    snapshot: Optional[SnapshotFile] = application.bot_data.get("automation_snapshot")
+    if snapshot:
+        snapshot.save(snapshot_automations(application.bot_data))
+    await close_cmc_client(application)
+
+
+def build_application(
+    token: str, automations_path: Optional[str] = None, max_concurrent_updates: int = 32
+) -> Application:
     client = CoinMarketCapClient()
     job_queue = JobQueue()
-    application = Application.builder().token(token).job_queue(job_queue).build()
+    application = (
+        Application.builder()
+        .token(token)
+        .job_queue(job_queue)
+        # Polling/run_webhook otherwise handle one update at a time, so one slow
+        # quote lookup would hold up every other chat.
+        .concurrent_updates(PerChatUpdateProcessor(max_concurrent_updates))
+        .rate_limiter(
+            # Telegram's documented limits: ~30 msg/s overall, 20/min per group.
+            AIORateLimiter(
+                overall_max_rate=30,
+                overall_time_period=1,
+                group_max_rate=20,
+                group_time_period=60,
+                # Wait out a 429's retry_after instead of failing the call.
+                max_retries=3,
+            )
+        )
+        .post_shutdown(on_shutdown)
+        .build()
+    )
     application.bot_data["cmc_client"] = client
+    # Per-user stores live for the whole process; create them once up front.
+    for store in USER_STORES:
+        application.bot_data[store] = {}
+    # Automation broadcast jobs keyed by (slug, period).
+    application.bot_data["broadcasts"] = {}
+    if automations_path:
+        snapshot = SnapshotFile(Path(automations_path))
+        application.bot_data["automation_snapshot"] = snapshot
+        restore_automations(application.context_types.context(application), snapshot.load())
 
     automation_pattern = button_regex("menu_automation")
     manage_pattern = button_regex("menu_manage")
@@ -1622,7 +1985,6 @@ def build_application(token: str) -> Application:
     discover_pattern = button_regex("menu_discover")
     watchlist_pattern = button_regex("menu_watchlist")
     alerts_pattern = button_regex("menu_alerts")
-    menu_pattern = combined_button_regex(MENU_KEYS)
 
     automation_conv = ConversationHandler(
         entry_points=[
@@ -1697,11 +2059,34 @@ def build_application(token: str) -> Application:
     application.add_handler(CallbackQueryHandler(cancel_menu, pattern="^cancel:"))
 
     application.add_handler(
-        MessageHandler(filters.TEXT & ~filters.COMMAND & ~filters.Regex(menu_pattern), handle_text)
+        MessageHandler(filters.TEXT & ~filters.COMMAND & ~MENU_BUTTON, handle_text)
     )
 
-    # Periodic alert checker (works while the process is warm)
+    # Background jobs (work while the process is warm)
     if application.job_queue:
+        # Batched auto-deletes of menus, commands and expired quotes.
+        application.job_queue.run_repeating(
+            flush_deletions_job,
+            interval=DELETION_FLUSH_SECONDS,
+            first=DELETION_FLUSH_SECONDS,
+            name="message-deleter",
+        )
+        # Keep symbol lookups warm so handlers never wait on the listing download.
+        application.job_queue.run_repeating(
+            refresh_symbols_job,
+            interval=client.cache_seconds,
+            # A cache restored from disk only needs refreshing once it expires.
+            first=client.seconds_until_stale(),
+            name="symbol-cache-refresh",
+        )
+        if automations_path:
+            application.job_queue.run_repeating(
+                save_automations_job,
+                interval=AUTOMATION_SAVE_SECONDS,
+                first=AUTOMATION_SAVE_SECONDS,
+                name="automation-snapshot",
+            )
+        # Periodic alert checker
         application.job_queue.run_repeating(
             check_price_alerts,
             interval=ALERT_CHECK_SECONDS,
@@ -1718,13 +2103,13 @@ async def _discover_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE, kind
     lang = get_user_language(context, update.effective_user.id)
     client: CoinMarketCapClient = context.bot_data["cmc_client"]
     if kind == "gainers":
-        items = client.fetch_movers("percent_change_24h", limit=10)
+        items = await client.fetch_movers("percent_change_24h", limit=10)
         text = format_movers(items, lang, "gainers_header")
     elif kind == "losers":
-        items = client.fetch_movers("percent_change_24h:asc", limit=10)
+        items = await client.fetch_movers("percent_change_24h:asc", limit=10)
         text = format_movers(items, lang, "losers_header")
     else:
-        items = client.fetch_movers("volume_24h", limit=10)
+        items = await client.fetch_movers("volume_24h", limit=10)
         text = format_movers(items, lang, "trending_header")
     rows = [
         [InlineKeyboardButton(f"Open {item.get('symbol')}", callback_data=f"quote:{item.get('symbol')}")]
@@ -1762,12 +2147,22 @@ def load_settings() -> Dict[str, object]:
     webhook_base = os.getenv("WEBHOOK_BASE_URL")
     webhook_path = os.getenv("WEBHOOK_PATH", "/api/webhook")
     port = int(os.getenv("PORT", "8080"))
+    workers = int(os.getenv("WEBHOOK_WORKERS", "8"))
+    max_concurrent_updates = int(os.getenv("MAX_CONCURRENT_UPDATES", "32"))
+    webhook_ack_wait = float(os.getenv("WEBHOOK_ACK_WAIT", "20"))
+    automations_path = os.getenv(
+        "AUTOMATIONS_PATH", str(default_state_dir() / "pocket_crypto_automations.json")
+    )
     return {
         "token": token,
         "use_webhook": use_webhook,
         "webhook_base": webhook_base,
         "webhook_path": webhook_path,
         "port": port,
+        "workers": workers,
+        "max_concurrent_updates": max_concurrent_updates,
+        "webhook_ack_wait": webhook_ack_wait,
+        "automations_path": automations_path,
     }
 
 
@@ -1779,7 +2174,9 @@ def main() -> None:
     webhook_path = settings["webhook_path"]
     port = settings["port"]
 
-    application = build_application(token)
+    application = build_application(
+        token, settings["automations_path"], settings["max_concurrent_updates"]
+    )
     logger.info("Bot is starting in %s mode", "webhook" if use_webhook else "polling")
 
     if use_webhook:
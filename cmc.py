@@ -2,15 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import re
 import time
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
 
-import requests
+import httpx
+
+from store import SnapshotFile, default_state_dir, loads
 
 logger = logging.getLogger(__name__)
 
+# /tmp on Vercel (survives warm restarts), a private state directory elsewhere.
+DEFAULT_CACHE_PATH = default_state_dir() / "pocket_crypto_symbols.json"
+
 
 class CoinMarketCapClient:
     """Lightweight client for public CoinMarketCap endpoints."""
@@ -19,38 +26,70 @@ class CoinMarketCapClient:
     DETAIL_URL = "https://api.coinmarketcap.com/data-api/v3/cryptocurrency/detail"
     MARKETS_URL = "https://api.coinmarketcap.com/data-api/v3/cryptocurrency/market-pairs/latest"
     NEWS_URL = "https://api.coinmarketcap.com/content/v3/news"
+    # Rows of the listing kept fully normalized for get_cached_listing.
+    LISTING_CACHE_SIZE = 100
+
+    HEADERS = {
+        "Accept": "application/json",
+        "User-Agent": "PocketCryptoBot/2.0 (+https://github.com/Mahdi-Habibi/pocket_crypto)",
+    }
 
-    def __init__(self, listing_limit: int = 5000, cache_seconds: int = 600):
+    # httpx keeps idle connections for only 5 s by default; hold them long
+    # enough that periodic jobs and bursts reuse the TLS session.
+    LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=16, keepalive_expiry=60)
+
+    def __init__(
+        self,
+        listing_limit: int = 2000,
+        cache_seconds: int = 600,
+        quote_ttl: int = 60,
+        cache_path: Optional[Path] = DEFAULT_CACHE_PATH,
+    ):
         self.listing_limit = listing_limit
         self.cache_seconds = cache_seconds
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "Accept": "application/json",
-                "User-Agent": "PocketCryptoBot/2.0 (+https://github.com/Mahdi-Habibi/pocket_crypto)",
-            }
-        )
+        self.quote_ttl = quote_ttl
+        self.cache_path = cache_path
+        self._cache_file = SnapshotFile(cache_path) if cache_path is not None else None
+        self._session: Optional[httpx.AsyncClient] = None
         self._symbol_cache: Dict[str, str] = {}
         self._name_cache: Dict[str, str] = {}
+        self._slug_symbols: Dict[str, str] = {}
         self._listing_cache: List[Dict] = []
         self._last_refresh = 0.0
+        self._quote_cache: Dict[str, Tuple[float, Dict]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._load_cache_file()
+
+    @property
+    def session(self) -> httpx.AsyncClient:
+        """Shared keep-alive client, created lazily on the running event loop."""
+        if self._session is None or self._session.is_closed:
+            self._session = httpx.AsyncClient(
+                headers=self.HEADERS, limits=self.LIMITS, follow_redirects=True
+            )
+        return self._session
 
-    def resolve_symbol(self, symbol: str) -> Optional[str]:
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client; call on application shutdown."""
+        if self._session is not None:
+            await self._session.aclose()
+            self._session = None
+
+    async def resolve_symbol(self, symbol: str) -> Optional[str]:
         """Return CoinMarketCap slug for a given ticker symbol."""
-        self._refresh_cache()
+        await self._ensure_cache()
         return self._symbol_cache.get(symbol.upper())
 
-    def symbol_for_slug(self, slug: str) -> Optional[str]:
+    async def symbol_for_slug(self, slug: str) -> Optional[str]:
         """Reverse-lookup ticker symbol for a CoinMarketCap slug."""
-        self._refresh_cache()
-        for symbol, cached_slug in self._symbol_cache.items():
-            if cached_slug == slug:
-                return symbol
-        return None
+        await self._ensure_cache()
+        return self._slug_symbols.get(slug)
 
-    def suggest_symbols(self, query: str, limit: int = 6) -> List[Dict[str, str]]:
+    async def suggest_symbols(self, query: str, limit: int = 6) -> List[Dict[str, str]]:
         """Suggest tickers/names that match a partial query."""
-        self._refresh_cache()
+        await self._ensure_cache()
         q = (query or "").strip().upper()
         if not q:
             return []
@@ -91,12 +130,48 @@ class CoinMarketCapClient:
                     break
         return suggestions
 
-    def fetch_quote(self, slug: str) -> Optional[Dict]:
-        """Fetch detailed statistics for a specific coin slug."""
+    async def fetch_quote(self, slug: str, fresh: bool = False) -> Optional[Dict]:
+        """Fetch detailed statistics for a coin slug, memoized for ``quote_ttl`` seconds.
+
+        Concurrent misses for the same slug share one in-flight request
+        (single-flight) instead of each hitting CoinMarketCap. ``fresh`` skips
+        the memoized copy, e.g. for an explicit refresh.
+        """
+        if not fresh:
+            quote = self._cached_quote(slug)
+            if quote is not None:
+                return quote
+        future = self._inflight.get(slug)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch_and_cache_quote(slug))
+            self._inflight[slug] = future
+            future.add_done_callback(lambda _: self._inflight.pop(slug, None))
+        # Shielded so one cancelled caller does not cancel the shared fetch.
+        return await asyncio.shield(future)
+
+    async def fetch_quotes(self, slugs: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """Fetch several quotes concurrently, one request per distinct slug."""
+        unique = list(dict.fromkeys(slugs))
+        quotes = await asyncio.gather(*(self.fetch_quote(slug) for slug in unique))
+        return dict(zip(unique, quotes))
+
+    def _cached_quote(self, slug: str) -> Optional[Dict]:
+        hit = self._quote_cache.get(slug)
+        if hit and time.time() - hit[0] < self.quote_ttl:
+            return hit[1]
+        return None
+
+    async def _fetch_and_cache_quote(self, slug: str) -> Optional[Dict]:
+        quote = await self._fetch_quote_uncached(slug)
+        if quote is not None:
+            self._quote_cache[slug] = (time.time(), quote)
+        return quote
+
+    async def _fetch_quote_uncached(self, slug: str) -> Optional[Dict]:
         try:
-            resp = self.session.get(self.DETAIL_URL, params={"slug": slug}, timeout=12)
+            resp = await self.session.get(self.DETAIL_URL, params={"slug": slug}, timeout=12)
             resp.raise_for_status()
-            data = resp.json().get("data")
+            data = loads(resp.content).get("data")
             if not data:
                 return None
             return {
@@ -107,20 +182,20 @@ class CoinMarketCapClient:
                 "stats": data.get("statistics") or {},
                 "description": (data.get("description") or "")[:280],
             }
-        except requests.RequestException as exc:
+        except (httpx.HTTPError, ValueError) as exc:
             logger.exception("Failed fetching detail for %s: %s", slug, exc)
             return None
 
-    def fetch_markets(self, slug: str, limit: int = 8) -> list:
+    async def fetch_markets(self, slug: str, limit: int = 8) -> list:
         """Fetch top markets (exchanges) where the coin trades."""
         try:
-            resp = self.session.get(
+            resp = await self.session.get(
                 self.MARKETS_URL,
                 params={"slug": slug, "start": 1, "limit": limit},
                 timeout=12,
             )
             resp.raise_for_status()
-            market_pairs = (resp.json().get("data") or {}).get("marketPairs") or []
+            market_pairs = (loads(resp.content).get("data") or {}).get("marketPairs") or []
             markets = []
             for pair in market_pairs:
                 base = pair.get("baseSymbol")
@@ -137,22 +212,22 @@ class CoinMarketCapClient:
                     }
                 )
             return markets
-        except requests.RequestException as exc:
+        except (httpx.HTTPError, ValueError) as exc:
             logger.exception("Failed fetching markets for %s: %s", slug, exc)
             return []
 
-    def fetch_news(self, coin_id: Optional[int], limit: int = 5) -> list:
+    async def fetch_news(self, coin_id: Optional[int], limit: int = 5) -> list:
         """Fetch latest news for the given coin id."""
         if not coin_id:
             return []
         try:
-            resp = self.session.get(
+            resp = await self.session.get(
                 self.NEWS_URL,
                 params={"cryptocurrencyId": coin_id, "size": limit},
                 timeout=12,
             )
             resp.raise_for_status()
-            items = resp.json().get("data") or []
+            items = loads(resp.content).get("data") or []
             news = []
             for item in items:
                 meta = item.get("meta") or {}
@@ -165,16 +240,16 @@ class CoinMarketCapClient:
                     }
                 )
             return news
-        except requests.RequestException as exc:
+        except (httpx.HTTPError, ValueError) as exc:
             logger.exception("Failed fetching news for %s: %s", coin_id, exc)
             return []
 
-    def fetch_predictions(self, slug: Optional[str], limit: int = 5) -> list:
+    async def fetch_predictions(self, slug: Optional[str], limit: int = 5) -> list:
         """Fetch price predictions from coin-predictions.com for the given slug."""
         if not slug:
             return []
         try:
-            resp = self.session.get(f"https://coin-predictions.com/{slug}/", timeout=12)
+            resp = await self.session.get(f"https://coin-predictions.com/{slug}/", timeout=12)
             if resp.status_code != 200:
                 return []
             html = resp.text
@@ -200,17 +275,17 @@ class CoinMarketCapClient:
                 if len(items) >= limit:
                     break
             return items
-        except requests.RequestException as exc:
+        except httpx.HTTPError as exc:
             logger.exception("Failed fetching predictions for %s: %s", slug, exc)
             return []
 
-    def fetch_movers(self, sort_by: str = "percent_change_24h", limit: int = 10) -> List[Dict]:
+    async def fetch_movers(self, sort_by: str = "percent_change_24h", limit: int = 10) -> List[Dict]:
         """Fetch top movers (gainers by default). Use sortType asc for losers."""
         sort_type = "desc"
         if sort_by.endswith(":asc"):
             sort_by, sort_type = sort_by.split(":", 1)[0], "asc"
         try:
-            resp = self.session.get(
+            resp = await self.session.get(
                 self.LISTING_URL,
                 params={
                     "start": 1,
@@ -225,16 +300,41 @@ class CoinMarketCapClient:
                 timeout=12,
             )
             resp.raise_for_status()
-            listing = (resp.json().get("data") or {}).get("cryptoCurrencyList") or []
+            listing = (loads(resp.content).get("data") or {}).get("cryptoCurrencyList") or []
             return [self._normalize_listing_item(item) for item in listing]
-        except requests.RequestException as exc:
+        except (httpx.HTTPError, ValueError) as exc:
             logger.exception("Failed fetching movers (%s): %s", sort_by, exc)
             return []
 
-    def get_cached_listing(self, limit: int = 20) -> List[Dict]:
-        self._refresh_cache()
+    async def get_cached_listing(self, limit: int = 20) -> List[Dict]:
+        await self._ensure_cache()
         return self._listing_cache[:limit]
 
+    async def refresh_symbols(self) -> None:
+        """Reload the symbol/listing cache regardless of its age.
+
+        Meant to run as a periodic background job so lookups rarely find the
+        cache stale.
+        """
+        await self._refresh_cache(force=True)
+
+    def seconds_until_stale(self) -> float:
+        """Seconds until the symbol cache is older than ``cache_seconds`` (0 if empty)."""
+        if not self._symbol_cache:
+            return 0.0
+        return max(0.0, self._last_refresh + self.cache_seconds - time.time())
+
+    async def _ensure_cache(self) -> None:
+        # A cold cache is loaded inline. A stale one is served while it reloads
+        # in the background: the refresh job may never fire on an instance
+        # that is frozen between requests.
+        if not self._symbol_cache:
+            await self._refresh_cache()
+        elif not self.seconds_until_stale() and (
+            self._refresh_task is None or self._refresh_task.done()
+        ):
+            self._refresh_task = asyncio.ensure_future(self._refresh_cache())
+
     def _normalize_listing_item(self, item: Dict) -> Dict:
         quote = (item.get("quotes") or [{}])[0]
         return {
@@ -251,11 +351,18 @@ class CoinMarketCapClient:
             "volume_24h": quote.get("volume24h"),
         }
 
-    def _refresh_cache(self) -> None:
+    async def _refresh_cache(self, force: bool = False) -> None:
         cache_valid = time.time() - self._last_refresh < self.cache_seconds
-        if self._symbol_cache and cache_valid:
+        if self._symbol_cache and cache_valid and not force:
             return
+        # Single-flight: callers that queued behind a refresh reuse its result.
+        seen_refresh = self._last_refresh
+        async with self._refresh_lock:
+            if self._last_refresh != seen_refresh:
+                return
+            await self._download_listing()
 
+    async def _download_listing(self) -> None:
         params = {
             "start": 1,
             "limit": self.listing_limit,
@@ -267,25 +374,70 @@ class CoinMarketCapClient:
             "audited": False,
         }
         try:
-            resp = self.session.get(self.LISTING_URL, params=params, timeout=20)
+            resp = await self.session.get(self.LISTING_URL, params=params, timeout=20)
             resp.raise_for_status()
-            payload = resp.json().get("data", {})
+            payload = loads(resp.content).get("data", {})
             listing = payload.get("cryptoCurrencyList", [])
             mapping: Dict[str, str] = {}
             names: Dict[str, str] = {}
-            normalized: List[Dict] = []
             for item in listing:
                 symbol = (item.get("symbol") or "").upper()
                 slug = item.get("slug")
                 name = item.get("name") or symbol
-                if symbol and slug and symbol not in mapping:
-                    mapping[symbol] = slug
-                    names[symbol] = name
-                normalized.append(self._normalize_listing_item(item))
-            self._symbol_cache = mapping
-            self._name_cache = names
+                # Sorted by market cap, so the first coin per ticker wins.
+                if symbol and slug:
+                    mapping.setdefault(symbol, slug)
+                    names.setdefault(symbol, name)
+            # Only the top of the listing is ever shown; skip normalizing the rest.
+            normalized = [
+                self._normalize_listing_item(item) for item in listing[: self.LISTING_CACHE_SIZE]
+            ]
+            self._set_symbols(mapping, names)
             self._listing_cache = normalized
             self._last_refresh = time.time()
             logger.info("Loaded %s symbols from CoinMarketCap", len(mapping))
-        except requests.RequestException as exc:
+        except (httpx.HTTPError, ValueError) as exc:
             logger.exception("Failed refreshing symbol cache: %s", exc)
+            return
+        await asyncio.to_thread(self._save_cache_file)
+
+    def _set_symbols(self, mapping: Dict[str, str], names: Dict[str, str]) -> None:
+        # Reverse index for symbol_for_slug; the first ticker per slug wins.
+        slug_symbols: Dict[str, str] = {}
+        for symbol, slug in mapping.items():
+            slug_symbols.setdefault(slug, symbol)
+        self._symbol_cache = mapping
+        self._name_cache = names
+        self._slug_symbols = slug_symbols
+
+    def _load_cache_file(self) -> None:
+        """Seed the symbol cache from disk when a fresh enough copy exists."""
+        if self._cache_file is None:
+            return
+        saved = self._cache_file.load()
+        if saved is None:
+            return
+        try:
+            ts = float(saved["ts"])
+            if time.time() - ts >= self.cache_seconds:
+                return
+            symbols, names, listing = saved["symbols"], saved["names"], saved["listing"]
+        except (ValueError, KeyError, TypeError) as exc:
+            logger.warning("Ignoring unreadable symbol cache %s: %s", self.cache_path, exc)
+            return
+        self._set_symbols(symbols, names)
+        self._listing_cache = listing
+        self._last_refresh = ts
+        logger.info("Loaded %s symbols from %s", len(symbols), self.cache_path)
+
+    def _save_cache_file(self) -> None:
+        if self._cache_file is None:
+            return
+        self._cache_file.save(
+            {
+                "ts": self._last_refresh,
+                "symbols": self._symbol_cache,
+                "names": self._name_cache,
+                "listing": self._listing_cache,
+            }
+        )
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from typing import Dict
+from functools import lru_cache
+from string import Formatter
+from typing import Dict, Optional, Tuple
 
 DEFAULT_LANGUAGE = "en"
 
@@ -289,21 +291,51 @@ def get_language_data(lang: str) -> Dict:
     return TEXTS.get(lang, TEXTS[DEFAULT_LANGUAGE])
 
 
-def translate(lang: str, key: str, **kwargs) -> str:
+Tokens = Tuple[Tuple[str, Optional[str]], ...]
+
+
+def _tokenize(template: str) -> Optional[Tokens]:
+    """Split a template into (literal, field) pairs, or None if it needs str.format."""
+    try:
+        parsed = tuple(Formatter().parse(template))
+    except ValueError:
+        return None
+    for _, field, spec, conversion in parsed:
+        if field is not None and (spec or conversion or not field.isidentifier()):
+            return None
+    return tuple((literal, field) for literal, field, _, _ in parsed)
+
+
+@lru_cache(maxsize=1024)
+def _compiled_template(lang: str, key: str) -> Tuple[str, Optional[Tokens]]:
     data = get_language_data(lang)
     template = data.get(key) or TEXTS[DEFAULT_LANGUAGE].get(key, "")
     if not isinstance(template, str):
-        return str(template)
+        return str(template), ((str(template), None),)
+    return template, _tokenize(template)
+
+
+def translate(lang: str, key: str, **kwargs) -> str:
+    template, tokens = _compiled_template(lang, key)
     try:
-        return template.format(**kwargs)
+        if tokens is None:
+            return template.format(**kwargs)
+        parts = []
+        for literal, field in tokens:
+            parts.append(literal)
+            if field is not None:
+                parts.append(format(kwargs[field]))
+        return "".join(parts)
     except (KeyError, ValueError):
         return template
 
 
+@lru_cache(maxsize=256)
 def get_period_label(lang: str, period: str) -> str:
     data = get_language_data(lang).get("periods", {})
     return data.get(period, TEXTS[DEFAULT_LANGUAGE]["periods"].get(period, period))
 
 
-def button_labels(key: str) -> list:
-    return [lang_data.get(key) for lang_data in TEXTS.values() if lang_data.get(key)]
+@lru_cache(maxsize=None)
+def button_labels(key: str) -> Tuple[str, ...]:
+    return tuple(lang_data.get(key) for lang_data in TEXTS.values() if lang_data.get(key))
@@ -0,0 +1,94 @@
+"""JSON helpers and on-disk snapshots for state the bot otherwise keeps in memory."""
+
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+from contextlib import suppress
+from pathlib import Path
+from typing import Any, Optional
+
+try:
+    import orjson
+
+    loads = orjson.loads
+
+    def dumps(obj) -> bytes:
+        # User and automation ids are int dict keys.
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+except ImportError:
+    import json
+
+    def loads(data):
+        # The stdlib parser does not accept memoryview.
+        return json.loads(bytes(data))
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+logger = logging.getLogger(__name__)
+
+
+def default_state_dir() -> Path:
+    """Directory for default snapshot paths.
+
+    Vercel only allows writes under /tmp, and an instance has it to itself.
+    Anywhere else a shared temp directory would let other local users read
+    or plant snapshots, so a per-user state directory is used instead.
+    """
+    if os.getenv("VERCEL"):
+        return Path(tempfile.gettempdir())
+    base = os.getenv("XDG_STATE_HOME")
+    return (Path(base) if base else Path.home() / ".local" / "state") / "pocket_crypto"
+
+
+class SnapshotFile:
+    """A private JSON file that is replaced atomically, and only when its content changes."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._last: Optional[bytes] = None
+
+    def load(self) -> Optional[Any]:
+        try:
+            with self.path.open("rb") as fh:
+                owner = os.fstat(fh.fileno()).st_uid
+                # A file someone else planted is not trusted (POSIX only).
+                if hasattr(os, "getuid") and owner != os.getuid():
+                    logger.warning("Ignoring snapshot %s owned by uid %s", self.path, owner)
+                    return None
+                data = fh.read()
+            value = loads(data)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable snapshot %s: %s", self.path, exc)
+            return None
+        self._last = data
+        return value
+
+    def save(self, value: Any) -> bool:
+        """Write ``value`` if it differs from the last load/save; return whether it did."""
+        data = dumps(value)
+        if data == self._last:
+            return False
+        tmp_name = None
+        try:
+            self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            # mkstemp creates the file 0600 under an unpredictable name.
+            fd, tmp_name = tempfile.mkstemp(
+                dir=self.path.parent, prefix=self.path.name + ".", suffix=".tmp"
+            )
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp_name, self.path)
+        except OSError as exc:
+            logger.warning("Could not write snapshot %s: %s", self.path, exc)
+            if tmp_name is not None:
+                with suppress(OSError):
+                    os.unlink(tmp_name)
+            return False
+        self._last = data
+        return True